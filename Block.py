@@ -1,9 +1,18 @@
 import time
 import json
-from hashlib import sha256
 from Transaction import Transaction
+from sha256_backend import sha256_digest
 
 class Block:
+    # Slots instead of a per-instance __dict__: blocks are numerous and
+    # long-lived, and fixed attribute storage keeps them compact
+    __slots__ = ("index", "timestamp", "transactions", "prev_hash", "nonce",
+                 "hash", "merkle_root", "_cached_dict", "_cached_header")
+
+    # The nonce is serialized as a fixed-width zero-padded string so mining
+    # can patch it in place without re-serializing the whole block
+    NONCE_WIDTH = 20
+
     def __init__(self, index, transactions, prev_hash, timestamp=None, nonce=0, hash_val=None):
         self.index = index
         self.timestamp = time.time() if timestamp is None else timestamp
@@ -12,29 +21,105 @@ class Block:
         self.nonce = nonce
         self.hash = hash_val if hash_val is not None else self.generate_hash()
 
+    def __setattr__(self, name, value):
+        # Serialized forms are cached; drop them when a field they embed
+        # changes. The header preimage does not depend on nonce (the nonce
+        # slot is patched per hash) or on the stored hash. The merkle root
+        # only changes with the transaction set.
+        if name in ("index", "timestamp", "transactions", "prev_hash"):
+            object.__setattr__(self, "_cached_dict", None)
+            object.__setattr__(self, "_cached_header", None)
+            if name == "transactions":
+                object.__setattr__(self, "merkle_root", None)
+        elif name in ("nonce", "hash"):
+            object.__setattr__(self, "_cached_dict", None)
+        object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _compute_merkle_root(transactions):
+        """Merkle root (hex) over the block's transactions.
+
+        Leaves hash each transaction's full canonical JSON (not just its id,
+        so the root commits to the contents as well); odd levels duplicate
+        their last node.
+        """
+        leaves = []
+        for tx in transactions:
+            tx_data = tx.to_dict() if isinstance(tx, Transaction) else tx
+            leaves.append(sha256_digest(json.dumps(tx_data, sort_keys=True).encode()))
+        if not leaves:
+            return sha256_digest(b'').hex()
+        while len(leaves) > 1:
+            if len(leaves) % 2:
+                leaves.append(leaves[-1])
+            leaves = [sha256_digest(leaves[i] + leaves[i + 1])
+                      for i in range(0, len(leaves), 2)]
+        return leaves[0].hex()
+
+    def get_merkle_root(self):
+        root = self.merkle_root
+        if root is None:
+            root = Block._compute_merkle_root(self.transactions)
+            object.__setattr__(self, "merkle_root", root)
+        return root
+
+    def header_bytes_with_nonce_slot(self):
+        """Serialize the block header once, leaving a fixed-width nonce slot.
+
+        Returns (header, slot) where header is a mutable bytearray of the
+        hash preimage and slot is the byte range holding the zero-padded
+        nonce digits. Mining only rewrites those bytes per attempt instead
+        of re-running the transaction list through json.dumps every nonce.
+        The serialized form is cached; repeat calls hand out fresh copies.
+        """
+        cached = self._cached_header
+        if cached is None:
+            # The transaction set is committed to via its merkle root, so
+            # the preimage is a fixed-shape header emitted with a direct
+            # template instead of generic-encoder dict walking. Only the
+            # timestamp needs json's number formatting. The nonce sits
+            # last so everything before the slot is constant per block:
+            # mining hashes that prefix once and reuses the midstate for
+            # every attempt (see proof_of_work).
+            prefix = '{"index": %d, "merkle_root": "%s", "prev_hash": "%s", "timestamp": %s, "nonce": "' % (
+                self.index, self.get_merkle_root(),
+                self.prev_hash, json.dumps(self.timestamp))
+            suffix = '"}'
+            start = len(prefix)
+            header = (prefix + "0" * Block.NONCE_WIDTH + suffix).encode()
+            cached = (header, slice(start, start + Block.NONCE_WIDTH))
+            object.__setattr__(self, "_cached_header", cached)
+        preimage, slot = cached
+        return bytearray(preimage), slot
+
+    @staticmethod
+    def encode_nonce(nonce):
+        """Fixed-width byte encoding of a nonce for the header slot."""
+        return b"%020d" % nonce
+
+    def generate_digest(self):
+        """Raw 32-byte hash of the block header at the current nonce."""
+        header, slot = self.header_bytes_with_nonce_slot()
+        header[slot] = Block.encode_nonce(self.nonce)
+        return sha256_digest(bytes(header))
+
     def generate_hash(self):
-        # Convert transactions to dictionaries for hashing
-        tx_data = [tx.to_dict() if isinstance(tx, Transaction) else tx for tx in self.transactions]
-        data = {
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "transactions": tx_data,
-            "prev_hash": self.prev_hash,
-            "nonce": self.nonce,
-        }
-        block_string = json.dumps(data, sort_keys=True)
-        return sha256(block_string.encode()).hexdigest()
+        return self.generate_digest().hex()
 
     def to_dict(self):
-        tx_data = [tx.to_dict() if isinstance(tx, Transaction) else tx for tx in self.transactions]
-        return {
-            "index": self.index,
-            "timestamp": self.timestamp,
-            "transactions": tx_data,
-            "prev_hash": self.prev_hash,
-            "nonce": self.nonce,
-            "hash": self.hash
-        }
+        cached = self._cached_dict
+        if cached is None:
+            tx_data = [tx.to_dict() if isinstance(tx, Transaction) else tx for tx in self.transactions]
+            cached = {
+                "index": self.index,
+                "timestamp": self.timestamp,
+                "transactions": tx_data,
+                "prev_hash": self.prev_hash,
+                "nonce": self.nonce,
+                "hash": self.hash
+            }
+            object.__setattr__(self, "_cached_dict", cached)
+        return cached
 
     @staticmethod
     def from_dict(data):
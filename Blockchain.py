@@ -1,16 +1,47 @@
+import hashlib
+import os
 import random
+from concurrent.futures import ProcessPoolExecutor
 from Block import Block
 from Transaction import Transaction
+import sha256_backend
+from sha256_backend import sha256_digest_batch
+
+try:
+    import pow_numba
+    _NUMBA_POW = pow_numba.AVAILABLE
+except ImportError:
+    _NUMBA_POW = False
 import threading
-from copy import deepcopy
+
+# Chains shorter than this are re-hashed serially; below it the process-pool
+# dispatch overhead outweighs the parallel hashing win
+PARALLEL_VALIDATE_MIN = 64
+
+_validate_pool = None
+
+def _get_validate_pool():
+    global _validate_pool
+    if _validate_pool is None:
+        _validate_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _validate_pool
+
+def _hash_block_worker(block_dict):
+    """Recompute a block's hash from its wire dict (picklable, lock-free)."""
+    return Block.from_dict(block_dict).generate_hash()
+
 
 class Blockchain:
     difficulty = 4
     BLOCK_SIZE_LIMIT = 3
     MINING_REWARD = 10
+    INITIAL_BALANCE = 100  # Every account starts with this
 
     def __init__(self):
         self.chain = []
+        # pubkey -> balance, updated incrementally as blocks are accepted so
+        # get_balance is a dict probe instead of an O(chain) replay
+        self.balances = {}
         self.lock = threading.Lock()
         self.create_genesis_block()
 
@@ -41,13 +72,52 @@ class Blockchain:
                 return False
             block.hash = block_hash
             self.chain.append(block)
+            self._apply_block_balances(block, self.balances)
             return True
 
+    @staticmethod
+    def _apply_block_balances(block, balances):
+        """Fold one block's transactions into a balance map."""
+        for tx in block.transactions:
+            if isinstance(tx, Transaction):
+                sender = balances.get(tx.sender_pubkey, Blockchain.INITIAL_BALANCE)
+                balances[tx.sender_pubkey] = sender - (tx.amount + tx.fee)
+                receiver = balances.get(tx.receiver_pubkey, Blockchain.INITIAL_BALANCE)
+                balances[tx.receiver_pubkey] = receiver + tx.amount
+
+    def _recompute_balances(self):
+        """Rebuild the balance map from scratch. Caller must hold the lock."""
+        balances = {}
+        for block in self.chain[1:]:  # Skip genesis
+            self._apply_block_balances(block, balances)
+        self.balances = balances
+
+    # (difficulty, 1 << (256 - 4*difficulty)) so the target integer isn't
+    # rebuilt every attempt but still tracks reassignments of `difficulty`
+    _target_cache = (None, None)
+
+    @staticmethod
+    def meets_difficulty(digest):
+        """Difficulty test as one 256-bit integer compare.
+
+        A digest has `difficulty` leading zero nibbles exactly when, read as
+        a big-endian integer, it is below 1 << (256 - 4*difficulty). One int
+        compare replaces byte slicing (and the old hex .startswith), and
+        keeps working for difficulties past 8 nibbles.
+        """
+        cached_difficulty, target = Blockchain._target_cache
+        if cached_difficulty != Blockchain.difficulty:
+            cached_difficulty = Blockchain.difficulty
+            target = 1 << (256 - 4 * cached_difficulty)
+            Blockchain._target_cache = (cached_difficulty, target)
+        return int.from_bytes(digest, 'big') < target
+
     def is_valid_block(self, block, block_hash):
         """Validate block's hash and difficulty."""
-        if not block_hash.startswith("0" * Blockchain.difficulty):
+        digest = block.generate_digest()
+        if not Blockchain.meets_difficulty(digest):
             return False
-        return block.generate_hash() == block_hash
+        return digest.hex() == block_hash
 
     def is_valid_chain(self, chain):
         """Validate an entire chain object (list of Blocks)."""
@@ -58,6 +128,8 @@ class Blockchain:
         if chain[0].prev_hash != "0":
             return False
 
+        # Cheap structural checks first: linkage and difficulty are O(1)
+        # per block and stay serial
         for i in range(1, len(chain)):
             curr = chain[i]
             prev = chain[i - 1]
@@ -66,45 +138,159 @@ class Blockchain:
                 return False
             if not curr.hash.startswith("0" * Blockchain.difficulty):
                 return False
-            if curr.generate_hash() != curr.hash:
-                return False
 
-        return True
+        # Hash recomputation is independent per block, so long chains are
+        # re-hashed across cores; short ones aren't worth the dispatch
+        blocks = chain[1:]
+        if len(blocks) >= PARALLEL_VALIDATE_MIN:
+            try:
+                pool = _get_validate_pool()
+                computed = pool.map(_hash_block_worker,
+                                    [b.to_dict() for b in blocks],
+                                    chunksize=8)
+                return all(h == b.hash for h, b in zip(computed, blocks))
+            except Exception:
+                pass  # pool unavailable (e.g. shutdown) - fall back to serial
+
+        return all(b.generate_hash() == b.hash for b in blocks)
 
     def replace_chain(self, new_chain):
-        """Replace local chain with new_chain if longer and valid."""
+        """Replace local chain with new_chain if longer and valid.
+
+        Validation (the expensive part — it re-hashes every block) runs
+        before taking the lock, so mining and balance reads aren't stalled
+        behind a multi-block sync; the length test is re-checked under the
+        lock since the local chain may have grown meanwhile. The candidate
+        was just built from the wire by the caller and nobody else holds
+        references to its blocks, so they are adopted as-is — the old
+        deepcopy re-cloned every block and transaction while holding the
+        lock for nothing.
+        """
+        if len(new_chain) <= len(self.chain) or not self.is_valid_chain(new_chain):
+            return False
         with self.lock:
-            if len(new_chain) > len(self.chain) and self.is_valid_chain(new_chain):
-                self.chain = deepcopy(new_chain)
-                return True
-        return False
+            if len(new_chain) <= len(self.chain):
+                return False
+            self.chain = list(new_chain)
+            self._recompute_balances()
+            return True
 
     def get_chain_copy(self):
+        # Blocks are immutable once appended, so a shallow snapshot of the
+        # list is enough — deepcopying every block and transaction here made
+        # every mine/sync/add_transaction call O(chain * txs)
         with self.lock:
-            return deepcopy(self.chain)
+            return self.chain[:]
+
+    # How many nonces the search loops try between staleness checks
+    STALE_CHECK_EVERY = 4096
+
+    def _is_stale(self, block):
+        """True when the chain tip moved away from the block being mined."""
+        with self.lock:
+            return self.chain[-1].hash != block.prev_hash
 
     def proof_of_work(self, block):
-        block.nonce = 0
-        h = block.generate_hash()
-        while not h.startswith("0" * Blockchain.difficulty):
-            block.nonce += 1
-            h = block.generate_hash()
-        return h
+        """Find a winning nonce for block, or None if the attempt went stale.
+
+        The search loops periodically check whether another block (gossip or
+        sync) extended the chain past this block's prev_hash; mining on is
+        then wasted work, so they abandon and the miner rebuilds on the new
+        tip.
+        """
+        # Prefer the JIT-compiled parallel scan, which splits the nonce
+        # space across cores and releases the GIL while mining
+        if _NUMBA_POW:
+            h = self._proof_of_work_numba(block)
+            if h is not None:
+                return h
+            if self._is_stale(block):
+                return None
+
+        # The batched search amortizes FFI overhead when the native SHA
+        # library is loaded; otherwise hash one nonce at a time
+        if sha256_backend.NATIVE:
+            return self.proof_of_work_batched(block)
+
+        # Scalar fallback: the nonce is the last header field, so the bytes
+        # before its slot are constant for this block. Hash them once and
+        # copy() the midstate per attempt — each nonce then only hashes the
+        # 20 nonce digits plus the closing quote/brace instead of the whole
+        # header again.
+        header, slot = block.header_bytes_with_nonce_slot()
+        base = hashlib.sha256(bytes(header[:slot.start]))
+        suffix = bytes(header[slot.stop:])
+        nonce = 0
+        while True:
+            h = base.copy()
+            h.update(Block.encode_nonce(nonce) + suffix)
+            digest = h.digest()
+            if Blockchain.meets_difficulty(digest):
+                block.nonce = nonce
+                return digest.hex()
+            nonce += 1
+            if nonce % Blockchain.STALE_CHECK_EVERY == 0 and self._is_stale(block):
+                return None
+
+    def _proof_of_work_numba(self, block):
+        """Nonce search via the numba kernel, or None if it can't be used.
+
+        The kernel compares only the first digest word, which covers
+        difficulties up to 8 leading nibbles.
+        """
+        if Blockchain.difficulty > 8:
+            return None
+        header, slot = block.header_bytes_with_nonce_slot()
+        buf = pow_numba.np.frombuffer(bytes(header), dtype=pow_numba.np.uint8).copy()
+        # Widen the scan range in the (rare) case a window is exhausted;
+        # staleness is only checked between windows since the kernel runs
+        # uninterrupted
+        for max_nonce in (1 << 22, 1 << 26, 1 << 31):
+            if self._is_stale(block):
+                return None
+            nonce = pow_numba.search_nonce(
+                buf, slot.start, slot.stop,
+                Blockchain.difficulty, max_nonce, 4096
+            )
+            if nonce >= 0:
+                block.nonce = int(nonce)
+                return block.generate_hash()
+        return None
+
+    def proof_of_work_batched(self, block, batch=8):
+        """Nonce search hashing `batch` candidates per backend call.
+
+        Stages `batch` copies of the header in one contiguous buffer, varies
+        only the nonce slot per lane, digests the whole batch in a single
+        sha256_digest_batch call, then scans the digests for the difficulty
+        prefix.
+        """
+        header, slot = block.header_bytes_with_nonce_slot()
+        n = len(header)
+        buf = bytearray(bytes(header) * batch)
+        nonce = 0
+        while True:
+            for lane in range(batch):
+                off = lane * n
+                buf[off + slot.start:off + slot.stop] = Block.encode_nonce(nonce + lane)
+            digests = sha256_digest_batch(bytes(buf), n, batch)
+            for lane in range(batch):
+                digest = digests[lane * 32:(lane + 1) * 32]
+                if Blockchain.meets_difficulty(digest):
+                    block.nonce = nonce + lane
+                    return digest.hex()
+            nonce += batch
+            if nonce % Blockchain.STALE_CHECK_EVERY < batch and self._is_stale(block):
+                return None
 
     def get_balance(self, pubkey):
-        """Calculate balance for a public key from the blockchain (blockchain history = currency acc to video)"""
-        balance = 100  # Initial balance for all accounts
+        """Balance for a public key (blockchain history = currency acc to video).
 
+        Reads the incrementally-maintained balance map rather than replaying
+        the whole chain per call.
+        """
         with self.lock:
-            for block in self.chain[1:]:  # Skip genesis
-                for tx in block.transactions:
-                    if isinstance(tx, Transaction):
-                        if tx.sender_pubkey == pubkey:
-                            balance -= (tx.amount + tx.fee)
-                        if tx.receiver_pubkey == pubkey:
-                            balance += tx.amount
-
-        return balance
+            return self.balances.get(pubkey, Blockchain.INITIAL_BALANCE)
 
     # This is also known as pending transaction
     def get_balance_with_mempool(self, pubkey, mempool):
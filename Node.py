@@ -1,38 +1,176 @@
 import random
 import threading
 import socket
+import selectors
+import queue
 import json
 import time
 import os
+import functools
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from Block import Block
 from Blockchain import Blockchain
-from Transaction import Transaction, create_reward_transaction
+from Transaction import Transaction, create_reward_transaction, COINBASE
+import gpu_miner
+import secp256k1_backend
+import wire
+
+# numpy vectorizes top-fee selection over large mempools; optional, the
+# sorted() path covers its absence
+try:
+    import numpy as np
+except ImportError:
+    np = None
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
 from cryptography.hazmat.backends import default_backend
 from cryptography.exceptions import InvalidSignature
 
+@functools.lru_cache(maxsize=4096)
+def _parse_pub(pem):
+    """Parse a PEM public key, cached: PEM/ASN.1 decoding dwarfs the actual
+    signature verification, and the same senders recur constantly. The only
+    uncached load left is the node's own key pair at startup."""
+    return serialization.load_pem_public_key(pem.encode(), backend=default_backend())
+
+@functools.lru_cache(maxsize=4096)
+def _fast_verifier(pem):
+    """libsecp256k1 verifier for a PEM public key; None without coincurve."""
+    return secp256k1_backend.verifier_for(_parse_pub(pem))
+
+# Shared pool for bulk signature verification; the ECDSA verify in
+# `cryptography` releases the GIL, so threads scale across cores here
+_verify_pool = None
+
+def _get_verify_pool():
+    global _verify_pool
+    if _verify_pool is None:
+        _verify_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _verify_pool
+
+
+class _ConnState:
+    """Per-connection state for the selector loop.
+
+    Incoming bytes accumulate in inbuf until a full message is parsed;
+    outgoing replies accumulate in outbuf and are drained when the socket
+    is writable. `legacy` is None until the first byte reveals whether the
+    peer speaks framed messages or bare JSON.
+    """
+    __slots__ = ("sock", "inbuf", "outbuf", "legacy", "eof", "pending",
+                 "closed", "_io_queue")
+
+    def __init__(self, sock, io_queue):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.legacy = None
+        self.eof = False
+        self.pending = 0   # dispatches in flight (selector thread's counter)
+        self.closed = False
+        self._io_queue = io_queue
+
+    def sendall(self, payload):
+        """Queue a reply; the selector loop owns the actual socket write."""
+        self._io_queue.put(('send', self, payload))
+
+
+class _PeerLink:
+    """Persistent outbound connection to one peer.
+
+    Gossip and chain-sync requests reuse the same socket instead of paying
+    a TCP handshake per message; on any error the socket is dropped and
+    rebuilt on the next send.
+    """
+    __slots__ = ("host", "port", "sock", "lock")
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.sock = None
+        self.lock = threading.Lock()
+
+    def _connect(self):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(2)
+        s.connect((self.host, self.port))
+        return s
+
+    def _drop(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def send(self, payload, expect_response=False, response_timeout=10):
+        """Send one framed payload; optionally read one framed reply.
+
+        Retries once through a fresh connection so a peer restart between
+        messages doesn't lose gossip. Raises OSError if both attempts fail.
+        """
+        with self.lock:
+            for attempt in (0, 1):
+                try:
+                    if self.sock is None:
+                        self.sock = self._connect()
+                    self.sock.sendall(payload)
+                    if not expect_response:
+                        return None
+                    self.sock.settimeout(response_timeout)
+                    try:
+                        return wire.read_message(self.sock)
+                    finally:
+                        self.sock.settimeout(2)
+                except (OSError, ConnectionError):
+                    self._drop()
+                    if attempt:
+                        raise
+            return None
+
+    def close(self):
+        with self.lock:
+            self._drop()
+
+
 class Node:
     """Base node class with transaction signing and validation"""
 #====================================================================================
 #                               NODE SETUP
 #====================================================================================
-    def __init__(self, name, port, node_dir, is_miner=False):
+    def __init__(self, name, port, node_dir, is_miner=False, gpu_mine=False):
         self.name = name
         self.port = port
         self.node_dir = node_dir
         self.is_miner = is_miner
+        # Opt-in GPU nonce search; only takes effect if cupy is installed
+        self.gpu_mine = gpu_mine
+        self._gpu_miner = None
         self.blockchain = Blockchain()
-        self.mempool = []
-        self.lock = threading.Lock()
+        # tx_id -> Transaction: O(1) membership and removal vs the old list
+        self.mempool = {}
+        # Separate locks so mempool traffic doesn't serialize against peer
+        # bookkeeping; critical sections stay short (no I/O under a lock)
+        self._mempool_lock = threading.Lock()
+        # Signalled when work for a miner may have appeared (new mempool tx,
+        # accepted peer block); the mining loop waits on this instead of
+        # polling on a fixed interval
+        self.mempool_cv = threading.Condition()
+        self._peers_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._unsynced_blocks = 0
         self.peers = []  # List of (host, port) tuples
+        self._peer_links = {}  # (host, port) -> _PeerLink
         self.socket = None
         
         # Load or generate keys
         os.makedirs(node_dir, exist_ok=True)
         self.private_key, self.public_key = self.load_or_generate_keys()
         self.public_key_str = self.public_key_to_string(self.public_key).strip()
+        # libsecp256k1 signer for the same key, or None without coincurve
+        self._fast_signer = secp256k1_backend.signer_for(self.private_key)
         
         # Ensure blockchain.json exists with at least the genesis block
         self.ensure_blockchain_file()
@@ -75,11 +213,11 @@ class Node:
                     )
                     return private_key, public_key
         
-        # Generate new keys through ecdsa
-        private_key = ec.generate_private_key(
-            ec.SECP256K1(),
-            backend=default_backend()
-        )
+        # Generate new keys. Ed25519 signs ~20x faster than the generic
+        # ECDSA backend with 64-byte signatures and far smaller PEMs;
+        # nodes whose .env already holds a SECP256K1 key keep using it
+        # (sign/verify dispatch on the parsed key type)
+        private_key = ed25519.Ed25519PrivateKey.generate()
 
         public_key = private_key.public_key()
 
@@ -114,56 +252,77 @@ class Node:
         return pem.decode()
     
     def string_to_public_key(self, key_str):
-        """Convert string to public key object"""
-        return serialization.load_pem_public_key(
-            key_str.encode(),
-            backend=default_backend()
-        )
+        """Convert string to public key object (cached parse)"""
+        return _parse_pub(key_str)
     
 #====================================================================================
 #                           TRANSACTION FUNCTIONS
 #====================================================================================
     def sign_transaction(self, tx):
         """Sign a transaction with private key (ECDSA)"""
-        signature = self.private_key.sign(
-            tx.get_signing_data(),
-            ec.ECDSA(hashes.SHA256())
-        )
+        data = tx.get_signing_data()
+        if self._fast_signer is not None:
+            signature = self._fast_signer.sign(data)
+        elif isinstance(self.private_key, ed25519.Ed25519PrivateKey):
+            signature = self.private_key.sign(data)
+        else:
+            signature = self.private_key.sign(data, ec.ECDSA(hashes.SHA256()))
         tx.signature = signature.hex()
         return tx
     
-    def verify_transaction(self, tx):
-        """Verify transaction signature and validity (ECDSA)"""
-        # Skip verification for coinbase transactions
-        if tx.sender_pubkey == "COINBASE":
+    def verify_signature(self, tx):
+        """Verify a transaction's signature (coinbase txs are exempt)"""
+        if tx.sender_pubkey == COINBASE:
             return True
         if not tx.signature:
             return False
 
         try:
-            public_key = self.string_to_public_key(tx.sender_pubkey)
-            public_key.verify(
-                bytes.fromhex(tx.signature),
-                tx.get_signing_data(),
-                ec.ECDSA(hashes.SHA256())
-            )
-
-            # Verify sender has sufficient balance
-            balance = self.blockchain.get_balance_with_mempool(tx.sender_pubkey, self.mempool)
-            if balance < tx.amount + tx.fee:
-                print(f"[{self.name}] Transaction {tx.tx_id[:8]} rejected: insufficient balance ({balance} < {tx.amount + tx.fee})")
-                return False
+            verifier = _fast_verifier(tx.sender_pubkey)
+            if verifier is not None:
+                if not secp256k1_backend.verify(verifier, bytes.fromhex(tx.signature),
+                                                tx.get_signing_data()):
+                    raise InvalidSignature()
+            else:
+                public_key = self.string_to_public_key(tx.sender_pubkey)
+                if isinstance(public_key, ed25519.Ed25519PublicKey):
+                    public_key.verify(bytes.fromhex(tx.signature),
+                                      tx.get_signing_data())
+                else:
+                    public_key.verify(
+                        bytes.fromhex(tx.signature),
+                        tx.get_signing_data(),
+                        ec.ECDSA(hashes.SHA256())
+                    )
             return True
-
         except (InvalidSignature, Exception) as e:
             print(f"[{self.name}] Transaction verification failed: {e}")
             return False
 
+    def verify_transaction(self, tx):
+        """Verify transaction signature and validity (ECDSA)"""
+        if not self.verify_signature(tx):
+            return False
+        if tx.sender_pubkey == COINBASE:
+            return True
+
+        # Verify sender has sufficient balance
+        balance = self.blockchain.get_balance_with_mempool(tx.sender_pubkey, self.mempool_snapshot())
+        if balance < tx.amount + tx.fee:
+            print(f"[{self.name}] Transaction {tx.tx_id_hex()[:8]} rejected: insufficient balance ({balance} < {tx.amount + tx.fee})")
+            return False
+        return True
+
     
+    def mempool_snapshot(self):
+        """Consistent list of pending transactions for lock-free iteration"""
+        with self._mempool_lock:
+            return list(self.mempool.values())
+
     def create_and_sign_transaction(self, receiver_pubkey, amount, fee=0):
         """Create and sign a transaction"""
         # Check balance
-        balance = self.blockchain.get_balance_with_mempool(self.public_key_str, self.mempool)
+        balance = self.blockchain.get_balance_with_mempool(self.public_key_str, self.mempool_snapshot())
         if balance < amount + fee:
             print(f"[{self.name}] Insufficient balance: {balance} < {amount + fee}")
             return None
@@ -192,17 +351,22 @@ class Node:
         # Verify transaction
         if not self.verify_transaction(tx):
             return False
-        
-        # Add to mempool
-        with self.lock:
-            if tx not in self.mempool:
-                self.mempool.append(tx)
-                print(f"[{self.name}] Added transaction {tx.tx_id[:8]} to mempool")
-                
-                # Gossip to peers
-                self.gossip_transaction(tx)
-                return True
-        return False
+
+        # Add to mempool; gossip happens outside the lock so peer I/O never
+        # blocks other mempool users
+        with self._mempool_lock:
+            if tx.tx_id in self.mempool:
+                return False
+            self.mempool[tx.tx_id] = tx
+        print(f"[{self.name}] Added transaction {tx.tx_id_hex()[:8]} to mempool")
+
+        # Wake the mining loop
+        with self.mempool_cv:
+            self.mempool_cv.notify_all()
+
+        # Gossip to peers
+        self.gossip_transaction(tx)
+        return True
     
     def gossip_transaction(self, tx):
         """Send transaction to all peers"""
@@ -227,15 +391,20 @@ class Node:
         appended = self.blockchain.add_block(block, block.hash)
         if appended:
             # Remove included txns from own mempool
-            with self.lock:
+            with self._mempool_lock:
                 for tx in block.transactions:
-                    if isinstance(tx, Transaction) and tx in self.mempool:
-                        self.mempool.remove(tx)
+                    if isinstance(tx, Transaction):
+                        self.mempool.pop(tx.tx_id, None)
 
             print(f"[{self.name}] Accepted block #{block.index}")
 
-            # Persist updated chain on *all* nodes
-            self.save_blockchain()
+            # Wake the mining loop: the tip moved, so any leftover mempool
+            # transactions should be rebuilt onto it promptly
+            with self.mempool_cv:
+                self.mempool_cv.notify_all()
+
+            # Persist just the new block on *all* nodes
+            self.append_block_to_disk(block)
 
             # Broadcast to peers
             self.gossip_block(block)
@@ -258,82 +427,256 @@ class Node:
 #                           UTILITY FUNCTIONS                                       
 #====================================================================================
     def start_server(self):
-        """Start listening for incoming connections"""
-        def server_thread():
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.socket.bind(('localhost', self.port))
-            self.socket.listen(1)
-            print(f"[{self.name}] Listening on port {self.port}")
-            
-            while True:
-                try:
-                    conn, addr = self.socket.accept()
-                    threading.Thread(target=self.handle_connection, args=(conn,), daemon=True).start()
-                except:
-                    break
-        
-        threading.Thread(target=server_thread, daemon=True).start()
+        """Start the selector-based server loop.
+
+        One thread multiplexes the listening socket and every live peer
+        connection; decoded messages are dispatched on a small worker pool
+        so a slow handler never stalls the event loop, and replies are
+        queued back to the loop, which owns all socket writes.
+        """
+        self._selector = selectors.DefaultSelector()
+        self._io_queue = queue.Queue()
+        self._dispatch_pool = ThreadPoolExecutor(max_workers=8)
+
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind(('localhost', self.port))
+        self.socket.listen(16)
+        self.socket.setblocking(False)
+        self._selector.register(self.socket, selectors.EVENT_READ, None)
+        print(f"[{self.name}] Listening on port {self.port}")
+
+        threading.Thread(target=self._serve_loop, daemon=True).start()
         time.sleep(0.1)
-    
-    def handle_connection(self, conn):
-        """Handle incoming connection"""
+
+    def _serve_loop(self):
+        while True:
+            try:
+                events = self._selector.select(timeout=0.5)
+            except OSError:
+                break
+            for key, mask in events:
+                # This thread is the node's whole network stack, so a
+                # fault in one connection's handling must cost only that
+                # connection, never the loop
+                try:
+                    if key.data is None:
+                        self._accept()
+                    else:
+                        state = key.data
+                        if mask & selectors.EVENT_WRITE:
+                            self._flush(state)
+                        if mask & selectors.EVENT_READ:
+                            self._read(state)
+                except Exception as e:
+                    print(f"[{self.name}] Error handling connection: {e}")
+                    if key.data is not None:
+                        self._close(key.data)
+            try:
+                self._drain_io_queue()
+            except Exception as e:
+                print(f"[{self.name}] Error draining replies: {e}")
+
+    def _accept(self):
         try:
-            data = b''
-            while True:
-                chunk = conn.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
-            
-            if data:
-                msg = json.loads(data.decode())
-                
-                if msg['type'] == 'transaction':
-                    tx = Transaction.from_dict(msg['data'])
-                    self.add_transaction(tx)
-                elif msg['type'] == 'block':
-                    block = Block.from_dict(msg['data'])
-                    self.receive_block(block)
-                elif msg['type'] == 'create_transaction':
-                    # Node creates, signs, and broadcasts transaction
-                    tx = self.create_and_sign_transaction(
-                        msg['receiver_pubkey'],
-                        msg['amount'],
-                        msg.get('fee', 0)
-                    )
-                    if tx:
-                        self.add_transaction(tx)
-                elif msg['type'] == 'get_chain':
-                    # Peer is asking for our current chain
-                    self.send_chain(conn)
+            conn, addr = self.socket.accept()
+        except OSError:
+            return
+        conn.setblocking(False)
+        state = _ConnState(conn, self._io_queue)
+        self._selector.register(conn, selectors.EVENT_READ, state)
+
+    def _read(self, state):
+        try:
+            data = state.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            self._close(state)
+            return
+
+        if not data:
+            state.eof = True
+            if state.legacy and state.inbuf:
+                # Legacy bare-JSON message is delimited by close
+                try:
+                    msg = json.loads(bytes(state.inbuf).decode())
+                except ValueError as e:
+                    print(f"[{self.name}] Error handling connection: {e}")
+                    self._close(state)
+                    return
+                state.inbuf.clear()
+                if not self._submit_dispatch(msg, state, False):
+                    self._close(state)
+                    return
+            self._update_interest(state)
+            self._maybe_close(state)
+            return
+
+        state.inbuf += data
+        if state.legacy is None:
+            state.legacy = state.inbuf[:1] == wire.LEGACY_JSON_OPEN
+        if state.legacy:
+            return  # wait for EOF
+
+        # Framed protocol: dispatch every complete message
+        while True:
+            try:
+                parsed = wire.try_parse_frame(state.inbuf)
+            except Exception as e:
+                print(f"[{self.name}] Error handling connection: {e}")
+                self._close(state)
+                return
+            if parsed is None:
+                break
+            msg, consumed = parsed
+            del state.inbuf[:consumed]
+            if not self._submit_dispatch(msg, state, True):
+                self._close(state)
+                return
+
+    def _submit_dispatch(self, msg, state, framed):
+        """Hand a decoded message to the worker pool; False if it's gone."""
+        state.pending += 1
+        try:
+            self._dispatch_pool.submit(self._dispatch_and_signal, msg, state, framed)
+            return True
+        except RuntimeError:  # pool shut down — interpreter teardown race
+            state.pending -= 1
+            return False
+
+    def _dispatch_and_signal(self, msg, state, framed):
+        try:
+            self.dispatch_message(msg, state, framed=framed)
         except Exception as e:
             print(f"[{self.name}] Error handling connection: {e}")
         finally:
-            conn.close()
+            self._io_queue.put(('done', state, None))
+
+    def _drain_io_queue(self):
+        """Apply queued replies / dispatch completions (selector thread only)"""
+        while True:
+            try:
+                op, state, payload = self._io_queue.get_nowait()
+            except queue.Empty:
+                return
+            if op == 'send':
+                state.outbuf += payload
+            else:
+                state.pending -= 1
+            self._update_interest(state)
+            self._maybe_close(state)
+
+    def _update_interest(self, state):
+        if state.closed:
+            return
+        interest = selectors.EVENT_READ if not state.eof else 0
+        if state.outbuf:
+            interest |= selectors.EVENT_WRITE
+        try:
+            if interest:
+                try:
+                    self._selector.modify(state.sock, interest, state)
+                except KeyError:
+                    self._selector.register(state.sock, interest, state)
+            else:
+                # Drained and read side closed: deregister until a queued
+                # reply (if any) re-adds write interest
+                try:
+                    self._selector.unregister(state.sock)
+                except KeyError:
+                    pass
+        except (ValueError, OSError):
+            pass
+
+    def _flush(self, state):
+        try:
+            sent = state.sock.send(bytes(state.outbuf))
+            del state.outbuf[:sent]
+        except BlockingIOError:
+            return
+        except OSError:
+            self._close(state)
+            return
+        self._update_interest(state)
+
+    def _maybe_close(self, state):
+        if state.eof and state.pending == 0 and not state.outbuf:
+            self._close(state)
+
+    def _close(self, state):
+        if state.closed:
+            return
+        state.closed = True
+        try:
+            self._selector.unregister(state.sock)
+        except (KeyError, ValueError, OSError):
+            pass
+        try:
+            state.sock.close()
+        except OSError:
+            pass
+
+    def dispatch_message(self, msg, conn, framed=True):
+        """Act on one decoded wire message"""
+        if msg['type'] == 'transaction':
+            tx = Transaction.from_dict(msg['data'])
+            self.add_transaction(tx)
+        elif msg['type'] == 'block':
+            block = Block.from_dict(msg['data'])
+            self.receive_block(block)
+        elif msg['type'] == 'create_transaction':
+            # Node creates, signs, and broadcasts transaction
+            tx = self.create_and_sign_transaction(
+                msg['receiver_pubkey'],
+                msg['amount'],
+                msg.get('fee', 0)
+            )
+            if tx:
+                self.add_transaction(tx)
+        elif msg['type'] == 'get_chain':
+            # Peer is asking for our current chain
+            self.send_chain(conn, framed=framed)
+        elif msg['type'] == 'get_tip':
+            # Cheap sync probe: just our height and tip hash
+            with self.blockchain.lock:
+                height = len(self.blockchain.chain)
+                tip_hash = self.blockchain.chain[-1].hash
+            conn.sendall(wire.pack_message({'type': 'tip', 'hash': tip_hash, 'height': height}))
+        elif msg['type'] == 'get_blocks':
+            # Peer asks for a block range [from, to) by index
+            with self.blockchain.lock:
+                blocks = self.blockchain.chain[msg['from']:msg['to']]
+            conn.sendall(wire.pack_message({
+                'type': 'blocks',
+                'data': [block.to_dict() for block in blocks]
+            }))
     
     def broadcast_to_peers(self, msg):
-        """Send message to all peers"""
-        for peer_host, peer_port in self.peers:
+        """Send message to all peers over their persistent links"""
+        payload = wire.pack_message(msg)  # serialize once for all peers
+        for link in self.peer_links():
             try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.settimeout(2)
-                s.connect((peer_host, peer_port))
-                s.sendall(json.dumps(msg).encode())
-                s.close()
-            except:
+                link.send(payload)
+            except (OSError, ConnectionError):
                 pass  # Silently ignore failed peer connections
-    
+
+    def peer_links(self):
+        with self._peers_lock:
+            return list(self._peer_links.values())
+
     def add_peer(self, host, port):
         """Add a peer to this node's peer list"""
-        if (host, port) not in self.peers and port != self.port:
-            self.peers.append((host, port))
+        with self._peers_lock:
+            if (host, port) not in self.peers and port != self.port:
+                self.peers.append((host, port))
+                self._peer_links[(host, port)] = _PeerLink(host, port)
 
 #====================================================================================
 #                   FORK RESOLUTION AND CHAIN SYNCHRONIZATION
 #====================================================================================
 
-    def send_chain(self, conn):
+    def send_chain(self, conn, framed=True):
         """Send this node's blockchain over an existing connection."""
         try:
             chain_copy = self.blockchain.get_chain_copy()
@@ -342,7 +685,11 @@ class Node:
                 'type': 'chain',
                 'data': chain_data
             }
-            conn.sendall(json.dumps(response).encode())
+            if framed:
+                conn.sendall(wire.pack_message(response))
+            else:
+                # Legacy unframed JSON requester
+                conn.sendall(json.dumps(response).encode())
         except Exception as e:
             print(f"[{self.name}] Error sending chain: {e}")
 
@@ -375,24 +722,24 @@ class Node:
                 print(f"[{self.name}] Replaced local chain with longer received chain ({len(new_chain)} blocks)")
 
                 # 1) Clean mempool: remove txs that are *now* in the adopted chain
-                with self.lock:
-                    self.mempool = [
-                        tx for tx in self.mempool
-                        if not (isinstance(tx, Transaction) and tx.tx_id in new_tx_ids)
-                    ]
-
-                    # 2) Re-inject orphan-only transactions from the old chain:
-                    #    those that were in old_chain but are NOT in new_chain.
-                    orphan_only_ids = set(old_tx_map.keys()) - new_tx_ids
-                    for tx_id in orphan_only_ids:
-                        tx = old_tx_map[tx_id]
-
-                        # Optionally re-validate under the new chain's balances
-                        if not self.verify_transaction(tx):
-                            continue
-
-                        if tx not in self.mempool:
-                            self.mempool.append(tx)
+                with self._mempool_lock:
+                    for tx_id in new_tx_ids:
+                        self.mempool.pop(tx_id, None)
+
+                # 2) Re-inject orphan-only transactions from the old chain:
+                #    those that were in old_chain but are NOT in new_chain.
+                #    Re-validation under the new chain's balances runs on the
+                #    verify pool (ECDSA verify releases the GIL).
+                orphans = [old_tx_map[tx_id]
+                           for tx_id in set(old_tx_map.keys()) - new_tx_ids]
+                if orphans:
+                    # Materialize before taking the lock: verification itself
+                    # snapshots the mempool
+                    results = list(_get_verify_pool().map(self.verify_transaction, orphans))
+                    with self._mempool_lock:
+                        for tx, ok in zip(orphans, results):
+                            if ok:
+                                self.mempool.setdefault(tx.tx_id, tx)
 
                 # Persist updated chain
                 self.save_blockchain()
@@ -401,34 +748,57 @@ class Node:
             print(f"[{self.name}] Error handling chain response: {e}")
 
     def request_chain_from_peers(self):
-        """Ask all peers for their chain; Blockchain.replace_chain decides whether to adopt."""
-        # print(f"[{self.name}] Starting chain sync from peers")
-        for peer_host, peer_port in self.peers:
+        """Sync with every peer, cheapest exchange first.
+
+        Each round asks for the peer's tip (hash + height) before anything
+        else; most of the time heights match and the sync costs one tiny
+        message instead of shipping the whole chain. When the peer is ahead,
+        only the missing block range is fetched and appended. Only if the
+        delta doesn't link onto our tip (a fork) does the sync fall back to
+        the full get_chain / replace_chain path.
+        """
+        for link in self.peer_links():
             try:
-                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                s.settimeout(10)
-                s.connect((peer_host, peer_port))
-                msg = {'type': 'get_chain'}
-                s.sendall(json.dumps(msg).encode())
-
-                # IMPORTANT: tell server we're done sending
-                s.shutdown(socket.SHUT_WR)
-
-                data = b''
-                while True:
-                    chunk = s.recv(4096)
-                    if not chunk:
-                        break
-                    data += chunk
-                    
-                if data:
-                    resp = json.loads(data.decode())
-                    if resp.get('type') == 'chain':
-                        # print(f"[{self.name}] Received chain data and handling it")
-                        self.handle_chain_response(resp['data'])
-                s.close()
+                self._sync_with_peer(link)
             except Exception as e:
-                print(f"[{self.name}] Sync with peer port:{peer_port} was reset by peer, will try to sync again in next cycle")
+                print(f"[{self.name}] Sync with peer port:{link.port} was reset by peer, will try to sync again in next cycle")
+
+    def _sync_with_peer(self, link):
+        tip = link.send(wire.pack_message({'type': 'get_tip'}), expect_response=True)
+        if not tip or tip.get('type') != 'tip':
+            return
+        with self.blockchain.lock:
+            local_height = len(self.blockchain.chain)
+        if tip['height'] <= local_height:
+            return  # Peer is not ahead; nothing to fetch
+
+        # Peer is ahead: fetch only the blocks we don't have
+        resp = link.send(wire.pack_message({
+            'type': 'get_blocks', 'from': local_height, 'to': tip['height']
+        }), expect_response=True)
+        if resp and resp.get('type') == 'blocks':
+            delta = [Block.from_dict(b) for b in resp['data']]
+            if delta and self._append_delta(delta):
+                return
+
+        # Delta didn't link (fork, or peer reorged mid-exchange): fall back
+        # to comparing full chains
+        resp = link.send(wire.pack_message({'type': 'get_chain'}), expect_response=True)
+        if resp and resp.get('type') == 'chain':
+            self.handle_chain_response(resp['data'])
+
+    def _append_delta(self, blocks):
+        """Append a fetched block range; True only if every block linked."""
+        for block in blocks:
+            if not self.blockchain.add_block(block, block.hash):
+                return False
+            with self._mempool_lock:
+                for tx in block.transactions:
+                    if isinstance(tx, Transaction):
+                        self.mempool.pop(tx.tx_id, None)
+            self.append_block_to_disk(block)
+        print(f"[{self.name}] Synced {len(blocks)} block(s) from peer (delta)")
+        return True
 
     def periodic_chain_sync(self):
         """Periodically synchronize chain with peers (longest-chain wins)."""
@@ -451,77 +821,190 @@ class Node:
         txs_to_mine = self.pick_transactions(Blockchain.BLOCK_SIZE_LIMIT - 1)
         if not txs_to_mine:
             return None
+
+        # Re-validate the candidates against the current chain state —
+        # balances may have shifted since they entered the mempool
+        txs_to_mine = self.validate_transactions_parallel(txs_to_mine)
+        if not txs_to_mine:
+            return None
         
         # Calculate total fees
         total_fees = sum(tx.fee for tx in txs_to_mine if isinstance(tx, Transaction))
-        
-        # Create reward transaction
-        reward_tx = create_reward_transaction(self.public_key_str, Blockchain.MINING_REWARD, total_fees)
-        
+
+        last_block = self.blockchain.last_block()
+
+        # Create reward transaction (id deterministic in height + miner)
+        reward_tx = create_reward_transaction(self.public_key_str, Blockchain.MINING_REWARD,
+                                              total_fees, block_height=last_block.index + 1)
+
         # Add reward transaction first
         all_txs = [reward_tx] + txs_to_mine
-        
-        last_block = self.blockchain.last_block()
         new_block = Block(last_block.index + 1, all_txs, last_block.hash)
-        block_hash = self.blockchain.proof_of_work(new_block)
+        block_hash = None
+        if self.gpu_mine and gpu_miner.AVAILABLE:
+            if self._gpu_miner is None:
+                self._gpu_miner = gpu_miner.GPUMiner()
+            block_hash = self._gpu_miner.mine_block(new_block, Blockchain.difficulty)
+        if block_hash is None:
+            block_hash = self.blockchain.proof_of_work(new_block)
+        if block_hash is None:
+            # Abandoned: the tip moved mid-mine, rebuild on it next cycle
+            return None
         new_block.hash = block_hash
         
         appended = self.blockchain.add_block(new_block, block_hash)
         if appended:
             print(f"[{self.name}] ⛏️  Mined Block #{new_block.index} with {len(txs_to_mine)} txns, reward={Blockchain.MINING_REWARD + total_fees}")
-            
+
             # Remove included txns from own mempool
-            with self.lock:
+            with self._mempool_lock:
                 for tx in txs_to_mine:
-                    if tx in self.mempool:
-                        self.mempool.remove(tx)
-            
-            # Save blockchain (update/commit block to own ledger first)
-            self.save_blockchain()
+                    self.mempool.pop(tx.tx_id, None)
             
+            # Append block to own ledger first
+            self.append_block_to_disk(new_block)
+
             # Broadcast block
             self.gossip_block(new_block)
             # return new_block  <= no use of returning this 
         return None
 
+    def validate_transactions_parallel(self, txs):
+        """Validate candidate transactions for inclusion in a block.
+
+        Signature checks are independent per transaction, so they run
+        concurrently on the shared verify pool (signature verification
+        releases the GIL in both crypto backends). Balance checks can't
+        count the candidates against themselves — they still sit in the
+        mempool here, so get_balance_with_mempool would subtract each
+        tx's own spend from the balance it is checked against. Instead
+        each sender's available balance is computed once over the *other*
+        pending transactions, and the candidates then deduct from it
+        cumulatively in input order, which also stops two transactions
+        from passing against the same coins. Returns the valid
+        transactions in input order.
+        """
+        if len(txs) > 1:
+            sig_ok = _get_verify_pool().map(self.verify_signature, txs)
+        else:
+            sig_ok = map(self.verify_signature, txs)
+
+        candidate_ids = {tx.tx_id for tx in txs}
+        other_pending = [tx for tx in self.mempool_snapshot()
+                         if tx.tx_id not in candidate_ids]
+        available = {}
+        valid = []
+        for tx, ok in zip(txs, sig_ok):
+            if not ok:
+                continue
+            sender = tx.sender_pubkey
+            if sender not in available:
+                available[sender] = self.blockchain.get_balance_with_mempool(
+                    sender, other_pending)
+            cost = tx.amount + tx.fee
+            if available[sender] < cost:
+                print(f"[{self.name}] Transaction {tx.tx_id_hex()[:8]} rejected: insufficient balance ({available[sender]} < {cost})")
+                continue
+            available[sender] -= cost
+            valid.append(tx)
+        return valid
+
     def pick_transactions(self, limit):
-        """Select transactions from mempool for mining"""
-        with self.lock:
-            # Sort by fee (highest first)
-            sorted_txs = sorted(self.mempool, key=lambda tx: tx.fee if isinstance(tx, Transaction) else 0, reverse=True)
-            return sorted_txs[:limit]
+        """Select the top-fee transactions from the mempool for mining"""
+        # Snapshot under the lock, select outside it
+        pending = self.mempool_snapshot()
+        if np is not None and len(pending) > limit:
+            # argpartition finds the top k in O(n) with C-speed compares;
+            # only those k are then ordered by fee like the sorted path
+            fees = np.fromiter(
+                (tx.fee if isinstance(tx, Transaction) else 0 for tx in pending),
+                dtype=np.float64, count=len(pending))
+            topk = np.argpartition(fees, -limit)[-limit:]
+            topk = topk[np.argsort(fees[topk])[::-1]]
+            return [pending[i] for i in topk]
+        sorted_txs = sorted(pending, key=lambda tx: tx.fee if isinstance(tx, Transaction) else 0, reverse=True)
+        return sorted_txs[:limit]
 
 #====================================================================================
 #                           BLOCKCHAIN FUNCTIONS
 #====================================================================================
+    # fsync the block log every this many appended blocks
+    FSYNC_EVERY = 8
+
+    def _log_path(self):
+        return os.path.join(self.node_dir, 'blockchain.dat')
+
     def save_blockchain(self):
-        """Save blockchain to JSON file"""
-        chain_data = [block.to_dict() for block in self.blockchain.get_chain_copy()]
-        blockchain_path = os.path.join(self.node_dir, 'blockchain.json')
-        with open(blockchain_path, 'w') as f:
-            json.dump(chain_data, f, indent=2)
-    
+        """Rewrite the whole block log (chain replacement / shutdown).
+
+        The per-block hot path is append_block_to_disk; this full rewrite
+        only runs when history itself changed.
+        """
+        chain_copy = self.blockchain.get_chain_copy()
+        with self._disk_lock:
+            tmp_path = self._log_path() + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                for block in chain_copy:
+                    f.write(wire.pack_message(block.to_dict()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._log_path())
+            self._unsynced_blocks = 0
+
+    def append_block_to_disk(self, block):
+        """Persist one accepted block as a framed record at the end of the log"""
+        with self._disk_lock:
+            with open(self._log_path(), 'ab') as f:
+                f.write(wire.pack_message(block.to_dict()))
+                self._unsynced_blocks += 1
+                if self._unsynced_blocks >= Node.FSYNC_EVERY:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._unsynced_blocks = 0
+
     def ensure_blockchain_file(self):
-        """Ensure blockchain.json exists (initialized with the current chain, including genesis)."""
-        blockchain_path = os.path.join(self.node_dir, 'blockchain.json')
-        if not os.path.exists(blockchain_path):
-            self.save_blockchain()
-            print(f"[{self.name}] Initialized new blockchain.json with genesis block")
+        """Ensure the block log exists (initialized with the current chain, including genesis)."""
+        if os.path.exists(self._log_path()):
+            return
+        # Don't shadow a legacy blockchain.json: load_blockchain will migrate
+        # from it and the next save writes the log
+        if os.path.exists(os.path.join(self.node_dir, 'blockchain.json')):
+            return
+        self.save_blockchain()
+        print(f"[{self.name}] Initialized new blockchain.dat with genesis block")
 
     def load_blockchain(self):
-        """Load blockchain from JSON file"""
-        blockchain_path = os.path.join(self.node_dir, 'blockchain.json')
-        if os.path.exists(blockchain_path):
-            try:
-                with open(blockchain_path, 'r') as f:
-                    chain_data = json.load(f)
-                    new_chain = [Block.from_dict(block_data) for block_data in chain_data]
-                    if self.blockchain.is_valid_chain(new_chain):
-                        with self.blockchain.lock:
-                            self.blockchain.chain = new_chain
-                        print(f"[{self.name}] Loaded blockchain with {len(new_chain)} blocks")
-            except Exception as e:
-                print(f"[{self.name}] Error loading blockchain: {e}")
+        """Load blockchain by streaming frames from the block log"""
+        chain_data = None
+        from_legacy = False
+        try:
+            if os.path.exists(self._log_path()):
+                with open(self._log_path(), 'rb') as f:
+                    chain_data = list(wire.iter_frames(f))
+            else:
+                # Fall back to the pre-binary-log JSON dump if one is present
+                json_path = os.path.join(self.node_dir, 'blockchain.json')
+                if os.path.exists(json_path):
+                    with open(json_path, 'r') as f:
+                        chain_data = json.load(f)
+                    from_legacy = True
+            if chain_data:
+                new_chain = [Block.from_dict(block_data) for block_data in chain_data]
+                if self.blockchain.is_valid_chain(new_chain):
+                    with self.blockchain.lock:
+                        self.blockchain.chain = new_chain
+                        self.blockchain._recompute_balances()
+                    print(f"[{self.name}] Loaded blockchain with {len(new_chain)} blocks")
+                    if from_legacy:
+                        # Migrate the loaded history into the block log now;
+                        # otherwise the first append would start a .dat
+                        # missing everything before it, and the next restart
+                        # would prefer that truncated log and discard the
+                        # chain
+                        self.save_blockchain()
+                        print(f"[{self.name}] Migrated blockchain.json to blockchain.dat")
+        except Exception as e:
+            print(f"[{self.name}] Error loading blockchain: {e}")
 
 #====================================================================================
 #                           FUCKASS FUNCTIONS
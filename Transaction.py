@@ -1,24 +1,63 @@
 import time
 import json
 import hashlib
-import uuid
+import secrets
+
+# Signing data is serialized with orjson (C-implemented; several times
+# faster than stdlib json) when available. The stdlib fallback is tuned to
+# emit the same compact byte form, but as with the wire format, a network
+# should run one serializer or the other: signatures cover the exact bytes.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sender/signature marker for mining rewards (no real key signs them)
+COINBASE = "COINBASE"
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 
 class Transaction:
+    # Fixed attribute storage: mempools hold thousands of these, and slots
+    # roughly halve the per-instance memory vs a __dict__ (96 bytes per
+    # instance plus field values); nothing touches tx.__dict__
+    __slots__ = ('tx_id', 'sender_pubkey', 'receiver_pubkey', 'amount',
+                 'fee', 'timestamp', 'signature', '_signing_cache', '_hash')
+
+    def __setattr__(self, name, value):
+        # The signing bytes embed every field except the signature itself;
+        # drop the cache when one of them changes (same invalidation scheme
+        # as Block's cached serializations). The identity hash only depends
+        # on tx_id.
+        if name != 'signature':
+            object.__setattr__(self, '_signing_cache', None)
+            if name == 'tx_id':
+                object.__setattr__(self, '_hash', None)
+        object.__setattr__(self, name, value)
+
     def __init__(self, sender_pubkey, receiver_pubkey, amount, fee=0, tx_id=None, signature=None, timestamp=None):
-        self.tx_id = tx_id if tx_id else str(uuid.uuid4())
+        # 16 raw random bytes: less than half the footprint of the old
+        # 36-char uuid string, and cheaper to hash for mempool dict ops.
+        # Legacy uuid-string ids from old chains are carried through as-is.
+        self.tx_id = tx_id if tx_id else secrets.token_bytes(16)
         self.sender_pubkey = sender_pubkey
         self.receiver_pubkey = receiver_pubkey
         self.amount = amount
         self.fee = fee
-        self.timestamp = timestamp if timestamp else time.time()
+        # Integer nanoseconds: no float formatting in the signing bytes and
+        # byte-identical serialization across platforms. Old transactions
+        # with float-second timestamps still round-trip through from_dict.
+        self.timestamp = timestamp if timestamp is not None else time.time_ns()
         self.signature = signature
 
+    def tx_id_hex(self):
+        """tx_id as a printable/JSON-safe string (legacy ids pass through)."""
+        return self.tx_id.hex() if isinstance(self.tx_id, bytes) else self.tx_id
+
     def to_dict(self):
         return {
-            'tx_id': self.tx_id,
+            'tx_id': self.tx_id_hex(),
             'sender_pubkey': self.sender_pubkey,
             'receiver_pubkey': self.receiver_pubkey,
             'amount': self.amount,
@@ -28,25 +67,42 @@ class Transaction:
         }
 
     def get_signing_data(self):
-        """Returns the data that should be signed (without signature)"""
-        data = {
-            'tx_id': self.tx_id,
-            'sender_pubkey': self.sender_pubkey,
-            'receiver_pubkey': self.receiver_pubkey,
-            'amount': self.amount,
-            'fee': self.fee,
-            'timestamp': self.timestamp
-        }
-        return json.dumps(data, sort_keys=True).encode()
+        """Returns the data that should be signed (without signature).
+
+        Serialized once and cached: a transaction's signing bytes are needed
+        at signing plus every verification as it propagates, and the fields
+        are fixed after construction.
+        """
+        cached = self._signing_cache
+        if cached is None:
+            data = {
+                'tx_id': self.tx_id_hex(),
+                'sender_pubkey': self.sender_pubkey,
+                'receiver_pubkey': self.receiver_pubkey,
+                'amount': self.amount,
+                'fee': self.fee,
+                'timestamp': self.timestamp
+            }
+            if orjson is not None:
+                cached = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+            else:
+                cached = json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+            object.__setattr__(self, '_signing_cache', cached)
+        return cached
 
     @staticmethod
     def from_dict(data):
+        # 32 hex chars = 16 raw bytes; anything else (e.g. a 36-char uuid
+        # from an old chain) is kept as the string it always was
+        tx_id = data['tx_id']
+        if isinstance(tx_id, str) and len(tx_id) == 32:
+            tx_id = bytes.fromhex(tx_id)
         return Transaction(
             sender_pubkey=data['sender_pubkey'],
             receiver_pubkey=data['receiver_pubkey'],
             amount=data['amount'],
             fee=data.get('fee', 0),
-            tx_id=data['tx_id'],
+            tx_id=tx_id,
             signature=data.get('signature'),
             timestamp=data.get('timestamp')
         )
@@ -57,19 +113,36 @@ class Transaction:
         return False
 
     def __hash__(self):
-        return hash(self.tx_id)
+        # Computed once per tx_id: transactions are hashed constantly as
+        # mempool dict keys and set members
+        h = self._hash
+        if h is None:
+            h = hash(self.tx_id)
+            object.__setattr__(self, '_hash', h)
+        return h
 
     def __repr__(self):
-        return f"Tx({self.tx_id[:8]}... {self.amount} from {self.sender_pubkey[:8]}... to {self.receiver_pubkey[:8]}...)"
+        return f"Tx({self.tx_id_hex()[:8]}... {self.amount} from {self.sender_pubkey[:8]}... to {self.receiver_pubkey[:8]}...)"
+
+def create_reward_transaction(miner_pubkey, amount, fee_sum, block_height=None):
+    """Create a mining reward transaction.
 
-def create_reward_transaction(miner_pubkey, amount, fee_sum):
-    """Create a mining reward transaction"""
+    Given the block height, the tx_id is derived from (height, miner) so
+    the same miner re-assembling the same block gets the same coinbase id
+    instead of drawing fresh randomness per attempt; without a height it
+    stays random.
+    """
+    if block_height is not None:
+        tx_id = hashlib.blake2b(f"{block_height}:{miner_pubkey}".encode(),
+                                digest_size=16).digest()
+    else:
+        tx_id = secrets.token_bytes(16)
     tx = Transaction(
-        sender_pubkey="COINBASE",
+        sender_pubkey=COINBASE,
         receiver_pubkey=miner_pubkey,
         amount=amount + fee_sum,
         fee=0,
-        tx_id=str(uuid.uuid4())
+        tx_id=tx_id
     )
-    tx.signature = "COINBASE"
+    tx.signature = COINBASE
     return tx
@@ -0,0 +1,170 @@
+"""Optional GPU proof-of-work backend (CUDA via CuPy).
+
+Node.mine dispatches here when the node was started with gpu_mine=True and
+cupy imports. The kernel gives every GPU thread a disjoint nonce, patches
+the decimal nonce slot in a thread-local copy of the header, runs a full
+SHA-256 over it and records the smallest winning nonce with atomicMin.
+
+The nonce is the last header field, so a shared midstate over the constant
+prefix would be possible here (the scalar CPU miner reuses one); this
+kernel still hashes the whole header per thread because headers are a few
+hundred bytes, the hashing is nowhere near the GPU's bottleneck, and a
+single generic kernel is simpler than one split at the nonce slot.
+Headers longer than MAX_HEADER fall back to the CPU search.
+"""
+
+try:
+    import cupy as cp
+    AVAILABLE = True
+except ImportError:
+    cp = None
+    AVAILABLE = False
+
+MAX_HEADER = 4096
+
+_KERNEL_SRC = r"""
+#define MAX_HEADER 4096
+
+__constant__ unsigned int K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5,
+    0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3,
+    0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc,
+    0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7,
+    0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13,
+    0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3,
+    0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5,
+    0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208,
+    0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+__device__ __forceinline__ unsigned int rotr(unsigned int x, int n)
+{
+    return (x >> n) | (x << (32 - n));
+}
+
+/* First 32 bits of sha256(buf[0:len]); enough for difficulty <= 8. */
+__device__ unsigned int sha256_first_word(const unsigned char *buf, int len)
+{
+    unsigned int h[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+    int total = ((len + 8) / 64 + 1) * 64;
+    unsigned int w[64];
+
+    for (int off = 0; off < total; off += 64) {
+        for (int t = 0; t < 16; t++) {
+            unsigned int v = 0;
+            for (int b = 0; b < 4; b++) {
+                int idx = off + t * 4 + b;
+                unsigned char byte;
+                if (idx < len)
+                    byte = buf[idx];
+                else if (idx == len)
+                    byte = 0x80;
+                else if (idx >= total - 8) {
+                    unsigned long long bits = (unsigned long long)len * 8;
+                    byte = (unsigned char)(bits >> (8 * (total - 1 - idx)));
+                } else
+                    byte = 0;
+                v = (v << 8) | byte;
+            }
+            w[t] = v;
+        }
+        for (int t = 16; t < 64; t++) {
+            unsigned int s0 = rotr(w[t-15], 7) ^ rotr(w[t-15], 18) ^ (w[t-15] >> 3);
+            unsigned int s1 = rotr(w[t-2], 17) ^ rotr(w[t-2], 19) ^ (w[t-2] >> 10);
+            w[t] = w[t-16] + s0 + w[t-7] + s1;
+        }
+
+        unsigned int a = h[0], b = h[1], c = h[2], d = h[3];
+        unsigned int e = h[4], f = h[5], g = h[6], hh = h[7];
+        for (int t = 0; t < 64; t++) {
+            unsigned int s1 = rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25);
+            unsigned int ch = (e & f) ^ (~e & g);
+            unsigned int t1 = hh + s1 + ch + K[t] + w[t];
+            unsigned int s0 = rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22);
+            unsigned int maj = (a & b) ^ (a & c) ^ (b & c);
+            unsigned int t2 = s0 + maj;
+            hh = g; g = f; f = e; e = d + t1;
+            d = c; c = b; b = a; a = t1 + t2;
+        }
+        h[0] += a; h[1] += b; h[2] += c; h[3] += d;
+        h[4] += e; h[5] += f; h[6] += g; h[7] += hh;
+    }
+    return h[0];
+}
+
+extern "C" __global__
+void pow_search(const unsigned char *header, int header_len,
+                int slot_start, int slot_stop, int difficulty,
+                unsigned long long base_nonce, unsigned long long *out_nonce)
+{
+    unsigned long long nonce = base_nonce
+        + (unsigned long long)blockIdx.x * blockDim.x + threadIdx.x;
+    unsigned char buf[MAX_HEADER];
+
+    if (nonce >= *out_nonce)  /* someone already won with a smaller nonce */
+        return;
+
+    for (int i = 0; i < header_len; i++)
+        buf[i] = header[i];
+
+    unsigned long long n = nonce;
+    for (int i = 0; i < slot_stop - slot_start; i++) {
+        buf[slot_stop - 1 - i] = '0' + (unsigned char)(n % 10);
+        n /= 10;
+    }
+
+    unsigned int shift = 32 - 4 * difficulty;
+    if ((sha256_first_word(buf, header_len) >> shift) == 0)
+        atomicMin(out_nonce, nonce);
+}
+"""
+
+_NO_WINNER = (1 << 64) - 1
+
+
+class GPUMiner:
+    """Persistent CUDA nonce searcher; one instance per mining node."""
+
+    def __init__(self, threads_per_block=256, blocks_per_launch=4096):
+        self.threads_per_block = threads_per_block
+        self.blocks_per_launch = blocks_per_launch
+        self._kernel = cp.RawKernel(_KERNEL_SRC, 'pow_search')
+
+    def search(self, header, slot, difficulty, max_nonce=1 << 40):
+        """Return the smallest nonce whose hash meets difficulty, or None."""
+        if len(header) > MAX_HEADER or difficulty > 8:
+            return None
+        d_header = cp.asarray(bytearray(header), dtype=cp.uint8)
+        d_out = cp.full(1, _NO_WINNER, dtype=cp.uint64)
+        per_launch = self.threads_per_block * self.blocks_per_launch
+        base = 0
+        while base < max_nonce:
+            self._kernel(
+                (self.blocks_per_launch,), (self.threads_per_block,),
+                (d_header, len(header), slot.start, slot.stop,
+                 difficulty, cp.uint64(base), d_out)
+            )
+            winner = int(d_out[0])
+            if winner != _NO_WINNER:
+                return winner
+            base += per_launch
+        return None
+
+    def mine_block(self, block, difficulty):
+        """Run the GPU search for a block; returns the hex hash or None."""
+        header, slot = block.header_bytes_with_nonce_slot()
+        nonce = self.search(header, slot, difficulty)
+        if nonce is None:
+            return None
+        block.nonce = nonce
+        return block.generate_hash()
@@ -0,0 +1,153 @@
+"""Optional Numba-compiled proof-of-work kernel.
+
+Blockchain.proof_of_work dispatches here when numba is importable: the
+nonce scan runs as an @njit(parallel=True, nogil=True) kernel over the raw
+header bytes, so prange splits the nonce space across cores and the GIL is
+released while mining (the node's network threads keep running).
+
+The SHA-256 compression below is written in numba-compatible Python
+(uint64 arithmetic masked to 32 bits). Without numba the kernels are still
+importable plain Python — far too slow to mine with, which is why
+AVAILABLE gates the dispatch — but it keeps them testable anywhere.
+
+hashlib cannot be used inside an njit kernel (and an objmode escape per
+nonce would reintroduce all the Python overhead the kernel removes),
+hence the self-contained compression instead of wrapping hashlib.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        def wrap(f):
+            return f
+        return wrap
+
+    prange = range
+
+MASK32 = 0xFFFFFFFF
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5,
+    0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3,
+    0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc,
+    0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7,
+    0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13,
+    0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3,
+    0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5,
+    0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208,
+    0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.uint64)
+
+
+@njit(cache=True)
+def _sha256_first_word(buf):
+    """First 32 bits of sha256(buf) as an int (enough for difficulty <= 8)."""
+    length = buf.shape[0]
+    padded_len = ((length + 8) // 64 + 1) * 64
+    padded = np.zeros(padded_len, dtype=np.uint8)
+    padded[:length] = buf
+    padded[length] = 0x80
+    bits = length * 8
+    for i in range(8):
+        padded[padded_len - 1 - i] = (bits >> (8 * i)) & 0xFF
+
+    h0 = 0x6a09e667
+    h1 = 0xbb67ae85
+    h2 = 0x3c6ef372
+    h3 = 0xa54ff53a
+    h4 = 0x510e527f
+    h5 = 0x9b05688c
+    h6 = 0x1f83d9ab
+    h7 = 0x5be0cd19
+
+    w = np.zeros(64, dtype=np.uint64)
+    for off in range(0, padded_len, 64):
+        for t in range(16):
+            j = off + t * 4
+            w[t] = ((np.uint64(padded[j]) << 24) | (np.uint64(padded[j + 1]) << 16)
+                    | (np.uint64(padded[j + 2]) << 8) | np.uint64(padded[j + 3]))
+        for t in range(16, 64):
+            x = w[t - 15]
+            s0 = (((x >> 7) | (x << 25)) ^ ((x >> 18) | (x << 14)) ^ (x >> 3)) & MASK32
+            x = w[t - 2]
+            s1 = (((x >> 17) | (x << 15)) ^ ((x >> 19) | (x << 13)) ^ (x >> 10)) & MASK32
+            w[t] = (w[t - 16] + s0 + w[t - 7] + s1) & MASK32
+
+        a, b, c, d = h0, h1, h2, h3
+        e, f, g, h = h4, h5, h6, h7
+        for t in range(64):
+            s1 = (((e >> 6) | (e << 26)) ^ ((e >> 11) | (e << 21))
+                  ^ ((e >> 25) | (e << 7))) & MASK32
+            ch = (e & f) ^ ((~e) & g)
+            t1 = (h + s1 + ch + _K[t] + w[t]) & MASK32
+            s0 = (((a >> 2) | (a << 30)) ^ ((a >> 13) | (a << 19))
+                  ^ ((a >> 22) | (a << 10))) & MASK32
+            maj = (a & b) ^ (a & c) ^ (b & c)
+            t2 = (s0 + maj) & MASK32
+            h = g
+            g = f
+            f = e
+            e = (d + t1) & MASK32
+            d = c
+            c = b
+            b = a
+            a = (t1 + t2) & MASK32
+
+        h0 = (h0 + a) & MASK32
+        h1 = (h1 + b) & MASK32
+        h2 = (h2 + c) & MASK32
+        h3 = (h3 + d) & MASK32
+        h4 = (h4 + e) & MASK32
+        h5 = (h5 + f) & MASK32
+        h6 = (h6 + g) & MASK32
+        h7 = (h7 + h) & MASK32
+
+    return h0
+
+
+@njit(cache=True)
+def _write_nonce(buf, slot_start, slot_stop, nonce):
+    """Write the zero-padded decimal nonce into its header slot."""
+    n = nonce
+    for i in range(slot_stop - slot_start):
+        buf[slot_stop - 1 - i] = 48 + n % 10
+        n //= 10
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def search_nonce(header, slot_start, slot_stop, difficulty, max_nonce, chunk):
+    """Scan [0, max_nonce) for a nonce meeting the difficulty.
+
+    Each prange chunk works on its own header copy; the smallest winning
+    nonce across chunks is returned, or -1 if the range is exhausted.
+    Difficulty is in leading zero hex nibbles and must be <= 8.
+    """
+    shift = 32 - 4 * difficulty
+    n_chunks = (max_nonce + chunk - 1) // chunk
+    winners = np.full(n_chunks, -1, dtype=np.int64)
+    for c in prange(n_chunks):
+        buf = header.copy()
+        hi = min((c + 1) * chunk, max_nonce)
+        for nonce in range(c * chunk, hi):
+            _write_nonce(buf, slot_start, slot_stop, nonce)
+            if (_sha256_first_word(buf) >> shift) == 0:
+                winners[c] = nonce
+                break
+    best = -1
+    for c in range(n_chunks):
+        if winners[c] >= 0 and (best < 0 or winners[c] < best):
+            best = winners[c]
+    return best
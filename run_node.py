@@ -29,24 +29,31 @@ def main():
     # Start mining loop if miner
     if args.miner:
         def mining_loop():
+            # Wait for a signal (new tx / accepted block) instead of polling
+            # every 200ms; the timeout bounds latency if a wake is missed
+            # while a mine() is already in progress
             while True:
+                with node.mempool_cv:
+                    node.mempool_cv.wait(timeout=1.0)
                 node.mine()
-                time.sleep(0.2)  # Mining interval
 
         mining_thread = threading.Thread(target=mining_loop, daemon=True)
         mining_thread.start()
         print(f"[{args.name}] Mining started")
 
-    # Keep node running
+    # Keep node running, printing status every 5s. Sleeping until the next
+    # tick (monotonic, so wall-clock jumps don't matter) fires exactly once
+    # per window — the old int(time.time()) % 5 check printed twice or not
+    # at all depending on sleep skew, and woke up every second to find out.
     try:
+        next_status = time.monotonic() + 5
         while True:
-            time.sleep(1)
-            # Periodically print status
-            if int(time.time()) % 5 == 0:
-                balance = node.get_balance()
-                mempool_size = len(node.mempool)
-                chain_len = len(node.blockchain.chain)
-                print(f"[{args.name}] Status - Balance: {balance}, Mempool: {mempool_size}, Chain: {chain_len} blocks")
+            time.sleep(max(0, next_status - time.monotonic()))
+            next_status += 5
+            balance = node.get_balance()
+            mempool_size = len(node.mempool)
+            chain_len = len(node.blockchain.chain)
+            print(f"[{args.name}] Status - Balance: {balance}, Mempool: {mempool_size}, Chain: {chain_len} blocks")
     except KeyboardInterrupt:
         print(f"\n[{args.name}] Shutting down...")
         node.save_blockchain()
@@ -0,0 +1,55 @@
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+# Accelerated SECP256K1 ECDSA via libsecp256k1 (coincurve), when installed.
+# The library is specialized to this one curve and signs/verifies roughly
+# 10x faster than cryptography's generic EC backend. Signatures are DER
+# over SHA-256 in both backends, so a network can mix nodes with and
+# without coincurve; keys stay in their existing PEM form and are
+# converted to raw secp256k1 material here.
+try:
+    import coincurve
+    from coincurve.ecdsa import cdata_to_der, der_to_cdata, signature_normalize
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+
+def _is_secp256k1(key):
+    return isinstance(key.curve, ec.SECP256K1)
+
+
+def signer_for(private_key):
+    """coincurve signer for a cryptography SECP256K1 private key, or None."""
+    if not AVAILABLE or not isinstance(private_key, ec.EllipticCurvePrivateKey):
+        return None
+    if not _is_secp256k1(private_key):
+        return None
+    secret = private_key.private_numbers().private_value.to_bytes(32, 'big')
+    return coincurve.PrivateKey(secret)
+
+
+def verifier_for(public_key):
+    """coincurve verifier for a cryptography SECP256K1 public key, or None."""
+    if not AVAILABLE or not isinstance(public_key, ec.EllipticCurvePublicKey):
+        return None
+    if not _is_secp256k1(public_key):
+        return None
+    point = public_key.public_bytes(serialization.Encoding.X962,
+                                    serialization.PublicFormat.CompressedPoint)
+    return coincurve.PublicKey(point)
+
+
+def verify(verifier, signature, data):
+    """Check a DER ECDSA signature over SHA-256.
+
+    libsecp256k1 only accepts low-S ("normalized") signatures, while
+    cryptography's backend may emit the equivalent high-S encoding, so the
+    signature is normalized first — both forms are valid for the same key
+    and data.
+    """
+    try:
+        signature = cdata_to_der(signature_normalize(der_to_cdata(signature))[1])
+        return verifier.verify(signature, data)
+    except Exception:
+        return False
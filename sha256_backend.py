@@ -0,0 +1,62 @@
+import os
+import ctypes
+from hashlib import sha256 as _hashlib_sha256
+
+# Optional native SHA-256 backend (SHA-NI, see sha256_shani.c). Mining spends
+# nearly all of its time hashing, so when the shared library has been built
+# and the CPU supports the SHA extensions we call it directly via ctypes and
+# skip hashlib's per-call OpenSSL dispatch. Everything falls back to hashlib
+# transparently when the library is absent.
+
+_LIB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'libsha256shani.so')
+
+def _load_native():
+    try:
+        lib = ctypes.CDLL(_LIB_PATH)
+        lib.sha256_shani_supported.restype = ctypes.c_int
+        if not lib.sha256_shani_supported():
+            return None
+        lib.sha256.argtypes = [ctypes.c_char_p, ctypes.c_size_t,
+                               ctypes.c_char_p]
+        lib.sha256.restype = None
+        lib.sha256_batch.argtypes = [ctypes.c_char_p, ctypes.c_size_t,
+                                     ctypes.c_size_t, ctypes.c_char_p]
+        lib.sha256_batch.restype = None
+        return lib
+    except OSError:
+        return None
+
+_native = _load_native()
+
+NATIVE = _native is not None
+
+if NATIVE:
+    def sha256_digest(data):
+        """Raw 32-byte SHA-256 digest via the native SHA-NI library."""
+        out = ctypes.create_string_buffer(32)
+        _native.sha256(data, len(data), out)
+        return out.raw
+
+    def sha256_digest_batch(data, msg_len, count):
+        """Digest `count` equal-length messages packed back to back.
+
+        Returns the concatenated 32-byte digests. A single FFI call covers
+        the whole batch, so the per-call ctypes overhead is amortized.
+        """
+        out = ctypes.create_string_buffer(32 * count)
+        _native.sha256_batch(data, msg_len, count, out)
+        return out.raw
+else:
+    def sha256_digest(data):
+        """Raw 32-byte SHA-256 digest via hashlib (no native library)."""
+        return _hashlib_sha256(data).digest()
+
+    def sha256_digest_batch(data, msg_len, count):
+        """hashlib fallback for the batched digest API."""
+        return b''.join(
+            _hashlib_sha256(data[i * msg_len:(i + 1) * msg_len]).digest()
+            for i in range(count)
+        )
+
+def sha256_hexdigest(data):
+    return sha256_digest(data).hex()
@@ -0,0 +1,149 @@
+/*
+ * SHA-256 with x86 SHA-NI instructions (SHA256RNDS2 / SHA256MSG1 / SHA256MSG2).
+ *
+ * Exposes a one-shot sha256(data, len, out32) used by sha256_backend.py via
+ * ctypes to speed up the proof-of-work hot loop. The Python side only loads
+ * this library if it exists and sha256_shani_supported() returns non-zero;
+ * otherwise it falls back to hashlib, so building this is optional:
+ *
+ *     gcc -O2 -msse4.1 -msha -shared -fPIC -o libsha256shani.so sha256_shani.c
+ *
+ * Compression function follows the reference intrinsics flow from
+ * noloader/SHA-Intrinsics, written as a compact 4-round-group loop.
+ */
+
+#include <stdint.h>
+#include <stddef.h>
+#include <string.h>
+#include <immintrin.h>
+
+int sha256_shani_supported(void)
+{
+    return __builtin_cpu_supports("sha") && __builtin_cpu_supports("sse4.1");
+}
+
+static const uint32_t K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5,
+    0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3,
+    0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc,
+    0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7,
+    0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13,
+    0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3,
+    0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5,
+    0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208,
+    0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
+};
+
+__attribute__((target("sha,sse4.1")))
+static void sha256_process(uint32_t state[8], const uint8_t *data, size_t blocks)
+{
+    const __m128i MASK = _mm_set_epi64x(0x0c0d0e0f08090a0bULL,
+                                        0x0405060700010203ULL);
+    __m128i STATE0, STATE1, TMP, MSG;
+    __m128i MSGV[4];
+    __m128i ABEF_SAVE, CDGH_SAVE;
+
+    /* Load and permute state into the ABEF / CDGH layout SHA-NI expects. */
+    TMP    = _mm_loadu_si128((const __m128i *)&state[0]);
+    STATE1 = _mm_loadu_si128((const __m128i *)&state[4]);
+    TMP    = _mm_shuffle_epi32(TMP, 0xB1);        /* CDAB */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0x1B);     /* EFGH */
+    STATE0 = _mm_alignr_epi8(TMP, STATE1, 8);     /* ABEF */
+    STATE1 = _mm_blend_epi16(STATE1, TMP, 0xF0);  /* CDGH */
+
+    while (blocks--) {
+        int i;
+
+        ABEF_SAVE = STATE0;
+        CDGH_SAVE = STATE1;
+
+        for (i = 0; i < 4; i++) {
+            MSGV[i] = _mm_loadu_si128((const __m128i *)(data + i * 16));
+            MSGV[i] = _mm_shuffle_epi8(MSGV[i], MASK);
+        }
+
+        for (i = 0; i < 16; i++) {
+            MSG    = _mm_add_epi32(MSGV[i & 3],
+                                   _mm_loadu_si128((const __m128i *)&K[i * 4]));
+            STATE1 = _mm_sha256rnds2_epu32(STATE1, STATE0, MSG);
+            MSG    = _mm_shuffle_epi32(MSG, 0x0E);
+            STATE0 = _mm_sha256rnds2_epu32(STATE0, STATE1, MSG);
+
+            /* Extend the message schedule for group i+1 (groups 4..15). */
+            if (i >= 3 && i < 15) {
+                int g = i + 1;
+                __m128i X;
+                TMP = _mm_alignr_epi8(MSGV[(g - 1) & 3], MSGV[(g - 2) & 3], 4);
+                X   = _mm_sha256msg1_epu32(MSGV[g & 3], MSGV[(g - 3) & 3]);
+                X   = _mm_add_epi32(X, TMP);
+                MSGV[g & 3] = _mm_sha256msg2_epu32(X, MSGV[(g - 1) & 3]);
+            }
+        }
+
+        STATE0 = _mm_add_epi32(STATE0, ABEF_SAVE);
+        STATE1 = _mm_add_epi32(STATE1, CDGH_SAVE);
+
+        data += 64;
+    }
+
+    /* Permute back to the canonical a..h word order. */
+    TMP    = _mm_shuffle_epi32(STATE0, 0x1B);     /* FEBA */
+    STATE1 = _mm_shuffle_epi32(STATE1, 0xB1);     /* DCHG */
+    STATE0 = _mm_blend_epi16(TMP, STATE1, 0xF0);  /* DCBA */
+    STATE1 = _mm_alignr_epi8(STATE1, TMP, 8);     /* HGFE */
+
+    _mm_storeu_si128((__m128i *)&state[0], STATE0);
+    _mm_storeu_si128((__m128i *)&state[4], STATE1);
+}
+
+void sha256(const uint8_t *data, size_t len, uint8_t out[32])
+{
+    uint32_t state[8] = {
+        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
+    };
+    uint8_t final[128];
+    size_t full = len / 64;
+    size_t rem = len % 64;
+    size_t pad_blocks;
+    uint64_t bits = (uint64_t)len * 8;
+    int i;
+
+    if (full)
+        sha256_process(state, data, full);
+
+    /* Final padding: 0x80, zeros, 64-bit big-endian message length. */
+    memset(final, 0, sizeof(final));
+    memcpy(final, data + full * 64, rem);
+    final[rem] = 0x80;
+    pad_blocks = (rem < 56) ? 1 : 2;
+    for (i = 0; i < 8; i++)
+        final[pad_blocks * 64 - 1 - i] = (uint8_t)(bits >> (8 * i));
+    sha256_process(state, final, pad_blocks);
+
+    for (i = 0; i < 8; i++) {
+        out[i * 4 + 0] = (uint8_t)(state[i] >> 24);
+        out[i * 4 + 1] = (uint8_t)(state[i] >> 16);
+        out[i * 4 + 2] = (uint8_t)(state[i] >> 8);
+        out[i * 4 + 3] = (uint8_t)(state[i]);
+    }
+}
+
+/*
+ * Hash `count` equal-length messages laid out back to back in `data`,
+ * writing `count` 32-byte digests to `out`. Used by the batched nonce
+ * search so one FFI call covers a whole batch of candidates.
+ */
+void sha256_batch(const uint8_t *data, size_t len, size_t count, uint8_t *out)
+{
+    size_t i;
+    for (i = 0; i < count; i++)
+        sha256(data + i * len, len, out + i * 32);
+}
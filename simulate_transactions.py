@@ -1,11 +1,137 @@
 #!/usr/bin/env python3
+import mmap
+import os
+import re
 import socket
 import json
 import time
+
+# orjson parses/encodes the config and pubkey-cache JSON several times
+# faster than stdlib json; both read either's output
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _dumps(obj):
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj).encode()
 import argparse
+import asyncio
 import threading
+import wire
 from Transaction import Transaction
 
+# One persistent connection per sender node: the old code opened, used and
+# closed a fresh TCP socket for every message, paying a 3-way handshake
+# (and leaving a TIME_WAIT entry) per transaction. Messages are framed with
+# the same length prefix the nodes speak, so many requests can share a
+# socket instead of being delimited by connection close. Sockets are shared
+# between the sequential loop and pool threads, so each port has a lock
+# serializing its sends; a dead connection is rebuilt once per send.
+_socks = {}        # port -> connected socket
+_sock_locks = {}   # port -> lock serializing use of that socket
+_sock_lock = threading.Lock()  # guards the two maps
+
+def _port_lock(port):
+    with _sock_lock:
+        lk = _sock_locks.get(port)
+        if lk is None:
+            lk = _sock_locks[port] = threading.Lock()
+        return lk
+
+def _get_sock(port):
+    with _sock_lock:
+        s = _socks.get(port)
+        if s is None:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Small request frames should go out immediately, and dead
+            # nodes should be noticed between batches
+            s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            s.connect(('localhost', port))
+            _socks[port] = s
+        return s
+
+def _drop_sock(port):
+    with _sock_lock:
+        s = _socks.pop(port, None)
+    if s is not None:
+        try:
+            s.close()
+        except OSError:
+            pass
+
+def _send_bytes(port, payload):
+    """Send raw bytes over the port's connection, reconnecting once."""
+    with _port_lock(port):
+        for attempt in (0, 1):
+            try:
+                _get_sock(port).sendall(payload)
+                return
+            except OSError:
+                _drop_sock(port)
+                if attempt:
+                    raise
+
+def _send_framed(port, msg):
+    """Send one framed message over the port's persistent connection."""
+    _send_bytes(port, wire.pack_message(msg))
+    return True
+
+def close_sockets():
+    """Close every persistent connection (end of run)."""
+    with _sock_lock:
+        socks = list(_socks.values())
+        _socks.clear()
+    for s in socks:
+        try:
+            s.close()
+        except OSError:
+            pass
+
+# Sequential requests are staged per sender and pushed with one sendall
+# per batch: one syscall carries many frames instead of one each, which
+# also removes the need for the old 0.1s "safety" sleep between requests
+FLUSH_EVERY = 100
+_pending = {}  # port -> [bytearray of staged frames, frame count]
+
+def queue_transaction(sender_port, receiver_port, amount, fee, pubkeys):
+    """Stage one transaction frame for a batched send (see flush_pending)."""
+    if receiver_port not in pubkeys:
+        print(f"Error: No public key found for receiver port {receiver_port}")
+        return False
+    msg = {
+        'type': 'create_transaction',
+        'receiver_pubkey': pubkeys[receiver_port],
+        'amount': amount,
+        'fee': fee
+    }
+    entry = _pending.setdefault(sender_port, [bytearray(), 0])
+    entry[0] += wire.pack_message(msg)
+    entry[1] += 1
+    print(f"Transaction: {amount} (fee: {fee}) from port {sender_port} to port {receiver_port}")
+    if entry[1] >= FLUSH_EVERY:
+        return flush_pending(sender_port)
+    return True
+
+def flush_pending(port=None):
+    """Send staged frames — one sendall per node connection."""
+    ports = [port] if port is not None else list(_pending)
+    ok = True
+    for p in ports:
+        entry = _pending.pop(p, None)
+        if not entry or not entry[0]:
+            continue
+        try:
+            _send_bytes(p, bytes(entry[0]))
+        except Exception as e:
+            print(f"Error sending batch to port {p}: {e}")
+            ok = False
+    return ok
+
 def send_transaction_request(sender_port, receiver_pubkey, amount, fee):
     """Send a transaction request to the sender node"""
     try:
@@ -17,12 +143,7 @@ def send_transaction_request(sender_port, receiver_pubkey, amount, fee):
             'fee': fee
         }
 
-        # Connect to sender node
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.connect(('localhost', sender_port))
-        s.sendall(json.dumps(msg).encode())
-        s.close()
-
+        _send_framed(sender_port, msg)
         print(f"Transaction request sent: {amount} to {receiver_pubkey[:8]}... from node on port {sender_port}")
         return True
     except Exception as e:
@@ -32,55 +153,97 @@ def send_transaction_request(sender_port, receiver_pubkey, amount, fee):
 def get_node_pubkey(port):
     """Get public key from a node"""
     try:
-        msg = {'type': 'get_pubkey'}
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.connect(('localhost', port))
-        s.sendall(json.dumps(msg).encode())
-
-        data = b''
-        while True:
-            chunk = s.recv(4096)
-            if not chunk:
-                break
-            data += chunk
-        s.close()
-
-        response = json.loads(data.decode())
+        # Hold the port's lock across the round trip so another thread's
+        # request can't interleave between our send and the reply. The
+        # timeout matters: a node that never answers (none currently
+        # handle get_pubkey) must not wedge this lock — and with it every
+        # future send to the port — forever.
+        with _port_lock(port):
+            s = _get_sock(port)
+            s.settimeout(5)
+            try:
+                s.sendall(wire.pack_message({'type': 'get_pubkey'}))
+                response = wire.read_message(s)
+            finally:
+                s.settimeout(None)
         return response['pubkey']
     except Exception as e:
+        # The stream may hold a half-read reply; start fresh next time
+        _drop_sock(port)
         print(f"Error getting pubkey from port {port}: {e}")
         return None
 
+# Parsed pubkeys are cached here between runs, keyed by each .env's mtime,
+# so warm starts skip re-opening and re-parsing every node's key file
+PUBKEY_CACHE = 'pubkeys.cache.json'
+
+def _find_env(port):
+    # Check both possible directory names: miner_node_{port} and node_{port}
+    for node_dir in (f"miner_node_{port}", f"node_{port}"):
+        path = os.path.join(node_dir, '.env')
+        if os.path.exists(path):
+            return path
+    return None
+
+_PUBKEY_RE = re.compile(rb'PUBLIC_KEY_START\n(.*?)\nPUBLIC_KEY_END', re.DOTALL)
+
+def _parse_env_pubkey(path):
+    """Extract the PEM public key block from a node's .env file.
+
+    Matches the compiled delimiter regex over an mmap of the file: the
+    search runs in C against the page cache with no intermediate string
+    copies.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+        with mm:
+            m = _PUBKEY_RE.search(mm)
+            if m is None:
+                return None
+            return m.group(1).decode().strip()
+
 def load_pubkeys(node_ports):
-    """Load public keys from all nodes"""
+    """Load public keys from all nodes (cached on disk across runs)"""
     print("Loading public keys from nodes...")
+    try:
+        with open(PUBKEY_CACHE, 'rb') as f:
+            entries = _loads(f.read())
+    except (OSError, ValueError):
+        entries = {}
+
     pubkeys = {}
-    
+    dirty = False
     for port in node_ports:
-        import os
-        
-        # Check both possible directory names: miner_node_{port} and node_{port}
-        possible_dirs = [f"miner_node_{port}", f"node_{port}"]
-        env_path = None
-        
-        for node_dir in possible_dirs:
-            test_path = os.path.join(node_dir, '.env')
-            if os.path.exists(test_path):
-                env_path = test_path
-                break
-        
-        if env_path:
-            with open(env_path, 'r') as f:
-                lines = f.readlines()
-            for i, line in enumerate(lines):
-                if line.strip() == 'PUBLIC_KEY_START':
-                    pubkey = ''.join(lines[i+1:]).split('PUBLIC_KEY_END')[0].strip()
-                    pubkeys[port] = pubkey
-                    print(f" Port {port}: {pubkey[:50]}...")
-                    break
-        else:
+        env_path = _find_env(port)
+        if env_path is None:
             print(f" ERROR: Could not find .env for port {port}")
-    
+            continue
+
+        mtime = os.stat(env_path).st_mtime
+        entry = entries.get(str(port))
+        if entry and entry.get('path') == env_path and entry.get('mtime') == mtime:
+            pubkeys[port] = entry['pubkey']
+            continue
+
+        pubkey = _parse_env_pubkey(env_path)
+        if pubkey is None:
+            print(f" ERROR: No public key block in {env_path}")
+            continue
+        pubkeys[port] = pubkey
+        entries[str(port)] = {'path': env_path, 'mtime': mtime, 'pubkey': pubkey}
+        dirty = True
+        print(f" Port {port}: {pubkey[:50]}...")
+
+    if dirty:
+        try:
+            with open(PUBKEY_CACHE, 'wb') as f:
+                f.write(_dumps(entries))
+        except OSError:
+            pass  # cache is an optimization; a failed write just means a cold next run
+
     return pubkeys
 
 def simulate_transaction(sender_port, receiver_port, amount, fee, pubkeys):
@@ -101,17 +264,72 @@ def simulate_transaction(sender_port, receiver_port, amount, fee, pubkeys):
             'fee': fee
         }
 
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.connect(('localhost', sender_port))
-        s.sendall(json.dumps(msg).encode())
-        s.close()
+        _send_framed(sender_port, msg)
+        print(f"Transaction: {amount} (fee: {fee}) from port {sender_port} to port {receiver_port}")
+        return True
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+async def simulate_transaction_async(sender_port, receiver_port, amount, fee, pubkeys):
+    """Async variant of simulate_transaction on its own connection.
 
+    Parallel fan-out runs many of these as tasks on one event loop — no
+    per-transaction thread and no cap beyond the open-FD limit.
+    """
+    if receiver_port not in pubkeys:
+        print(f"Error: No public key found for receiver port {receiver_port}")
+        return False
+    msg = {
+        'type': 'create_transaction',
+        'receiver_pubkey': pubkeys[receiver_port],
+        'amount': amount,
+        'fee': fee
+    }
+    try:
+        reader, writer = await asyncio.open_connection('localhost', sender_port)
+        writer.write(wire.pack_message(msg))
+        await writer.drain()
+        writer.close()
+        await writer.wait_closed()
         print(f"Transaction: {amount} (fee: {fee}) from port {sender_port} to port {receiver_port}")
         return True
     except Exception as e:
         print(f"Error: {e}")
         return False
 
+async def _run_transactions(config, pubkeys):
+    tasks = []
+    for i, tx_config in enumerate(config['transactions']):
+        sender_port = tx_config['sender_port']
+        receiver_port = tx_config['receiver_port']
+        amount = tx_config['amount']
+        fee = tx_config.get('fee', 0)
+        delay = tx_config.get('delay', 0)
+        parallel = tx_config.get('parallel', False)
+
+        if delay > 0:
+            # Staged frames must actually be on the wire before we wait
+            flush_pending()
+            print(f"\nWaiting {delay} seconds before next transaction...")
+            await asyncio.sleep(delay)
+
+        print(f"\n--- Transaction {i+1}/{len(config['transactions'])} ---")
+
+        if parallel:
+            # Flush this sender first so earlier staged requests keep their
+            # order relative to the parallel one
+            flush_pending(sender_port)
+            tasks.append(asyncio.ensure_future(simulate_transaction_async(
+                sender_port, receiver_port, amount, fee, pubkeys)))
+        else:
+            # Sequential requests are staged and sent in batches
+            queue_transaction(sender_port, receiver_port, amount, fee, pubkeys)
+
+    flush_pending()
+    if tasks:
+        await asyncio.gather(*tasks)
+
 def main():
     parser = argparse.ArgumentParser(description='Simulate blockchain transactions')
     parser.add_argument('--config', required=True, help='JSON config file with transaction scenarios')
@@ -119,8 +337,8 @@ def main():
     args = parser.parse_args()
 
     # Load configuration
-    with open(args.config, 'r') as f:
-        config = json.load(f)
+    with open(args.config, 'rb') as f:
+        config = _loads(f.read())
 
     # Get all node ports from config
     all_ports = set()
@@ -134,34 +352,8 @@ def main():
     print(f"\nStarting transaction simulation with {len(config['transactions'])} transactions...")
     time.sleep(2)  # Give nodes time to fully start
 
-    # Execute transactions
-    for i, tx_config in enumerate(config['transactions']):
-        sender_port = tx_config['sender_port']
-        receiver_port = tx_config['receiver_port']
-        amount = tx_config['amount']
-        fee = tx_config.get('fee', 0)
-        delay = tx_config.get('delay', 0)
-        parallel = tx_config.get('parallel', False)
-
-        if delay > 0:
-            print(f"\nWaiting {delay} seconds before next transaction...")
-            time.sleep(delay)
-
-        print(f"\n--- Transaction {i+1}/{len(config['transactions'])} ---")
-
-        if parallel:
-            # Execute in parallel (non-blocking)
-            threading.Thread(
-                target=simulate_transaction,
-                args=(sender_port, receiver_port, amount, fee, pubkeys),
-                daemon=True
-            ).start()
-        else:
-            # Execute sequentially (blocking)
-            simulate_transaction(sender_port, receiver_port, amount, fee, pubkeys)
-
-        time.sleep(0.1)  # very Small delay between requests just for safety
-
+    asyncio.run(_run_transactions(config, pubkeys))
+    close_sockets()
     print("\nAll transactions submitted!")
     print("Monitor the node terminals to see transaction processing and mining...")
 
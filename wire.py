@@ -0,0 +1,103 @@
+import json
+import struct
+
+# Wire helpers for node-to-node messages: every message is a 4-byte
+# big-endian length prefix followed by the serialized body. Framing lets
+# several messages share one TCP connection instead of relying on
+# connection close to delimit. Bodies are msgpack when the library is
+# available (3-10x faster than stdlib json and ~40% smaller) and JSON
+# otherwise; a network must run one format or the other.
+#
+# Legacy peers/tools still send bare unframed JSON, which always starts
+# with '{' — a framed message never does, since a length prefix under 16MB
+# starts with a zero byte. Receivers use that first byte to tell them apart.
+
+try:
+    import msgpack
+
+    def _packb(msg):
+        return msgpack.packb(msg, use_bin_type=True)
+
+    def _unpackb(body):
+        return msgpack.unpackb(body, raw=False)
+
+    MSGPACK = True
+except ImportError:
+    MSGPACK = False
+
+    def _packb(msg):
+        return json.dumps(msg).encode()
+
+    def _unpackb(body):
+        return json.loads(body.decode())
+
+_HEADER = struct.Struct('>I')
+
+LEGACY_JSON_OPEN = b'{'
+
+
+def pack_message(msg):
+    """Serialize a message dict into one length-prefixed frame."""
+    body = _packb(msg)
+    return _HEADER.pack(len(body)) + body
+
+
+def _recv_exact(sock, n, prefix=b''):
+    """Read exactly n bytes (counting prefix); None on clean EOF at a boundary."""
+    data = bytearray(prefix)
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            if not data:
+                return None
+            raise ConnectionError("connection closed mid-frame")
+        data += chunk
+    return bytes(data)
+
+
+def try_parse_frame(buf):
+    """Parse one frame off the front of a receive buffer.
+
+    Returns (message, bytes_consumed) when a full frame is buffered,
+    else None. Used by non-blocking readers that accumulate partial data.
+    """
+    if len(buf) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(bytes(buf[:_HEADER.size]))
+    end = _HEADER.size + length
+    if len(buf) < end:
+        return None
+    return _unpackb(bytes(buf[_HEADER.size:end])), end
+
+
+def iter_frames(stream):
+    """Yield decoded messages from a file-like object of framed records.
+
+    Stops cleanly at EOF; a torn final record (e.g. crash mid-write) is
+    dropped rather than raised so an append-only log stays loadable.
+    """
+    while True:
+        header = stream.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        (length,) = _HEADER.unpack(header)
+        body = stream.read(length)
+        if len(body) < length:
+            return
+        yield _unpackb(body)
+
+
+def read_message(sock, prefix=b''):
+    """Read one framed message from a socket; None on EOF.
+
+    `prefix` carries bytes the caller already consumed while sniffing the
+    protocol (see LEGACY_JSON_OPEN).
+    """
+    header = _recv_exact(sock, _HEADER.size, prefix)
+    if header is None:
+        return None
+    (length,) = _HEADER.unpack(header)
+    body = _recv_exact(sock, length)
+    if body is None:
+        raise ConnectionError("connection closed before frame body")
+    return _unpackb(body)